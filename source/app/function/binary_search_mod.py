@@ -17,13 +17,17 @@ import json
 import os
 import sys
 import threading
-from typing import Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 
 DISABLED_PREFIX = "DISABLED "
 
-# Tracks folders this program disabled: list of disabled_on_disk_path strings
-program_disabled: List[str] = []
+# Worker threads used to overlap the renames of one bisection step
+_RENAME_WORKERS = 8
+
+# Tracks folders this program disabled: set of disabled_on_disk_path strings
+program_disabled: Set[str] = set()
 # optional path where runtime-disabled entries are saved so recovery is possible
 STATE_FILE: Optional[str] = None
 
@@ -34,6 +38,14 @@ STOP_EVENT: Optional[threading.Event] = None
 # Optional list of on-disk paths to exclude from the bisection
 EXCLUDE_PATHS: List[str] = []
 
+# Cached `find_mod_folders` results keyed by (start_path, skip_prefix). Each
+# entry also holds the mtime of every folder the walk scanned; a hit is only
+# used while all of them are unchanged (a rename, new or removed entry in any
+# scanned folder updates that folder's mtime).
+_mod_cache: Dict[
+    Tuple[str, Optional[str]], Tuple[List[Dict[str, str]], List[Tuple[str, int]]]
+] = {}
+
 # Ask function used for interactive prompts. Can be overridden by callers
 # (e.g., UI code) to provide GUI dialogs instead of console input.
 ASK_FN = input
@@ -42,6 +54,11 @@ ASK_FN = input
 # prints to stdout as before.
 RESULT_FN = None
 
+# State-file writes queued by the rename loop and written by `_flush_state()`:
+# paths to append, and whether a full rewrite (compaction) is needed instead.
+_pending_lines: List[str] = []
+_pending_compact = False
+
 
 def _is_disabled_name(name: str) -> bool:
     return name.startswith(DISABLED_PREFIX)
@@ -88,10 +105,13 @@ def enable_folder(disabled_path: str) -> str:
 
 
 def _rename_with_retry(src: str, dst: str) -> bool:
-    """Attempt to rename `src` -> `dst`.
+    """Attempt to rename `src` -> `dst` with `os.replace`.
 
+    `os.replace` is a single MoveFileExW call on Windows and behaves the same
+    on every platform, so no existence check is done beforehand.
     On failure, prompt the user to: 다시시도(R), 건너뛰기(S), 중단(A).
-    Returns True if rename succeeded, False if user skipped.
+    Returns True if rename succeeded, False if user skipped or `src` does
+    not exist (callers rely on this instead of checking beforehand).
     Raises an exception if the user chooses to abort or if an unexpected
     exception occurs and the user selects abort.
     """
@@ -99,11 +119,16 @@ def _rename_with_retry(src: str, dst: str) -> bool:
         if STOP_EVENT and STOP_EVENT.is_set():
             raise RuntimeError("사용자 요청으로 탐색 중단됨")
         try:
-            os.rename(src, dst)
+            os.replace(src, dst)
             return True
+        except FileNotFoundError:
+            # nothing to rename; not an error worth asking about
+            return False
         except Exception as e:
             print(f"폴더 이름을 바꾸는 동안 오류가 발생했습니다: {src}")
             print(f"오류: {e}")
+            # make sure everything renamed so far is recorded before waiting
+            _flush_state()
             resp = ASK_FN("[R] 다시시도, [S] 건너뛰기, [A] 중단 중 선택: ").strip().lower()
             if not resp:
                 continue
@@ -121,26 +146,171 @@ def _rename_with_retry(src: str, dst: str) -> bool:
             print("유효한 선택이 아닙니다. R, S, A 중에서 선택하세요.")
 
 
-def find_mod_folders(start_path: Optional[str]) -> List[Dict[str, str]]:
+def _iter_mod_dirs(
+    path: str,
+    skip_prefix: Optional[str] = None,
+    scanned: Optional[List[Tuple[str, int]]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield `(name, path)` for each mod folder at or below `path`.
+
+    A folder is a mod folder when it directly contains an `.ini` file
+    (symlinks to `.ini` files do not count); its subfolders are not searched further. Unreadable folders are skipped,
+    as are subfolders whose name starts with `skip_prefix` (if given).
+    If `scanned` is given, `(path, mtime_ns)` of every folder read is appended
+    to it; the mtime is taken before reading so later changes are noticed.
+    """
+    subdirs: List[str] = []
+    try:
+        if scanned is not None:
+            scanned.append((path, os.stat(path).st_mtime_ns))
+        with os.scandir(path) as it:
+            for e in it:
+                n = e.name
+                if n[-4:].lower() == ".ini" and e.is_file(follow_symlinks=False):
+                    # first .ini is enough; stop reading the rest of the folder
+                    yield (os.path.basename(path), path)
+                    return
+                if skip_prefix and n.startswith(skip_prefix):
+                    continue
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.path)
+    except OSError:
+        return
+    # recurse only after the scandir handle is closed
+    for d in subdirs:
+        yield from _iter_mod_dirs(d, skip_prefix, scanned)
+
+
+def _rename_parallel(pairs: List[Tuple[str, str]]) -> List[Optional[bool]]:
+    """Rename every `(src, dst)` in `pairs` once, using a thread pool.
+
+    Returns one result per pair: True if renamed, False if `src` does not
+    exist, None if the rename failed otherwise. Failed pairs are left to the
+    caller to retry via `_rename_with_retry`, so any user prompt happens on
+    the calling thread and one at a time.
+    """
+    if STOP_EVENT and STOP_EVENT.is_set():
+        raise RuntimeError("사용자 요청으로 탐색 중단됨")
+
+    def attempt(pair: Tuple[str, str]) -> Optional[bool]:
+        try:
+            os.replace(*pair)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError:
+            return None
+
+    if len(pairs) < 2:
+        return [attempt(pair) for pair in pairs]
+    with ThreadPoolExecutor(max_workers=min(_RENAME_WORKERS, len(pairs))) as ex:
+        return list(ex.map(attempt, pairs))
+
+
+def find_mod_folders(
+    start_path: Optional[str], skip_prefix: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """Return `{"name", "path"}` dicts for mod folders under `start_path`.
+
+    Subtrees whose folder name starts with `skip_prefix` are not walked.
+    """
     if not start_path:
         return []
     start_path = os.path.abspath(start_path)
     if not os.path.isdir(start_path):
         return []
 
-    mods: List[Dict[str, str]] = []
-    for dirpath, dirnames, files in os.walk(start_path, topdown=True):
-        if any(f.lower().endswith(".ini") for f in files):
-            mods.append(
-                {"name": os.path.basename(dirpath), "path": os.path.abspath(dirpath)}
-            )
-            dirnames[:] = []
+    key = (start_path, skip_prefix)
+    cached = _mod_cache.get(key)
+    if cached is not None and _scan_unchanged(cached[1]):
+        return [dict(m) for m in cached[0]]
+
+    scanned: List[Tuple[str, int]] = []
+    mods = [
+        {"name": name, "path": path}
+        for name, path in _iter_mod_dirs(start_path, skip_prefix, scanned)
+    ]
+    _mod_cache[key] = ([dict(m) for m in mods], scanned)
     return mods
 
 
-def _save_state() -> None:
-    """Write `program_disabled` to STATE_FILE (atomic replace)."""
-    global STATE_FILE
+def _scan_unchanged(scanned: List[Tuple[str, int]]) -> bool:
+    """Return True if every `(path, mtime_ns)` in `scanned` still matches."""
+    try:
+        return all(os.stat(p).st_mtime_ns == mt for p, mt in scanned)
+    except OSError:
+        return False
+
+
+def clear_mod_cache() -> None:
+    """Drop all cached `find_mod_folders` results."""
+    _mod_cache.clear()
+
+
+def _save_state_append(path: str) -> None:
+    """Queue one disabled-on-disk `path` for the state file.
+
+    The state file is a newline-delimited log; queued paths are appended on
+    the next `_flush_state()` so the rename loop never waits on disk I/O.
+    """
+    if STATE_FILE:
+        _pending_lines.append(path)
+
+
+def _schedule_compact() -> None:
+    """Request a full rewrite of the state file on the next flush."""
+    global _pending_compact
+    if STATE_FILE:
+        _pending_compact = True
+
+
+def _fsync_dir(path: str) -> None:
+    """fsync directory `path` so a rename inside it is durable (POSIX only)."""
+    if os.name == "nt":
+        # directories cannot be opened for fsync on Windows
+        return
+    try:
+        dfd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
+
+
+def _flush_state() -> None:
+    """Write queued state changes to STATE_FILE and fsync them.
+
+    Called at bisection-step boundaries (before prompting the user) and when
+    the run ends, so the state on disk is current whenever the program waits.
+    The queue is only cleared once the write succeeded; on failure it is kept
+    for the next flush and the exception propagates.
+    """
+    global _pending_compact
+    if STATE_FILE:
+        if _pending_compact:
+            _compact_state()
+        elif _pending_lines:
+            d = os.path.dirname(STATE_FILE)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            with open(STATE_FILE, "a", encoding="utf-8") as f:
+                f.write("".join(p + "\n" for p in _pending_lines))
+                f.flush()
+                os.fsync(f.fileno())
+    _pending_lines.clear()
+    _pending_compact = False
+
+
+def _compact_state() -> None:
+    """Rewrite STATE_FILE with the current `program_disabled` (atomic replace).
+
+    Drops log lines for folders that were re-enabled since they were
+    appended. Removes the state file when nothing is disabled anymore.
+    """
     if not STATE_FILE:
         return
     # ensure target directory exists
@@ -154,29 +324,36 @@ def _save_state() -> None:
             os.remove(STATE_FILE)
         return
 
-    data = list(program_disabled)
     tmp = STATE_FILE + ".tmp"
     with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+        f.write("".join(p + "\n" for p in program_disabled))
+        f.flush()
+        os.fsync(f.fileno())
     os.replace(tmp, STATE_FILE)
+    _fsync_dir(d or os.curdir)
 
 
 def _load_state(path: str) -> List[str]:
+    """Return the deduplicated paths recorded in the state file at `path`.
+
+    Older state files stored a JSON list; those are still accepted.
+    """
     if not os.path.exists(path):
         return []
     with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    out: List[str] = []
-    for item in data:
-        if isinstance(item, str):
-            out.append(item)
-    return out
+        text = f.read()
+    if text.lstrip().startswith("["):
+        items = [item for item in json.loads(text) if isinstance(item, str)]
+    else:
+        items = [line for line in text.splitlines() if line]
+    # keep first-seen order
+    return list(dict.fromkeys(items))
 
 
 def recover_from_state(path: str, state_file: str) -> int:
     """Recover (enable) entries recorded in state file. Returns number restored.
 
-    State file contains a JSON list of disabled-on-disk paths (strings).
+    State file contains disabled-on-disk paths, one per line.
     """
     # Pre-recover: if a backup exists in workspace temp, try to restore it
     restored_backup = False
@@ -213,16 +390,29 @@ def recover_from_state(path: str, state_file: str) -> int:
     restored = 0
     data = _load_state(state_file)
     for disabled in data:
-        if os.path.exists(disabled) and _is_disabled_name(os.path.basename(disabled)):
-            enable_folder(disabled)
+        if _is_disabled_name(os.path.basename(disabled)) and enable_folder(disabled) != disabled:
             restored += 1
+            program_disabled.discard(disabled)
     # remove state file after attempting recovery
     if os.path.exists(state_file):
         os.remove(state_file)
     return restored
 
 
+def _write_lines(lines: List[str]) -> None:
+    """Write `lines` to stdout with a single write and flush."""
+    sys.stdout.write("".join(line + "\n" for line in lines))
+    sys.stdout.flush()
+
+
 def run_bisection(start_path: str) -> None:
+    global _pending_compact
+    # The module may be reused for several runs in one process (GUI), so
+    # start from a clean slate; leftovers would be taken as still disabled.
+    program_disabled.clear()
+    _pending_lines.clear()
+    _pending_compact = False
+
     # Pre-run: backup ..\d3dx_user.ini (relative to `start_path`) into workspace temp
     try:
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
@@ -239,87 +429,98 @@ def run_bisection(start_path: str) -> None:
         # Do not fail the operation if backup cannot be made; just continue.
         pass
 
-    mods = find_mod_folders(start_path)
+    # disabled folders (and everything under them) are never candidates, so
+    # do not walk into them at all
+    mods = find_mod_folders(start_path, skip_prefix=DISABLED_PREFIX)
     if not mods:
         print("모드를 찾지 못했습니다.")
         return
 
-    # Human-friendly mod list output
-    print(f"발견된 모드 수: {len(mods)}")
-    for m in mods:
-        print(f"- {m.get('name')}: {m.get('path')}")
+    # Human-friendly mod list output, written in one go
+    out = [f"발견된 모드 수: {len(mods)}"]
+    out.extend(f"- {m.get('name')}: {m.get('path')}" for m in mods)
+    _write_lines(out)
 
     # Build candidate list (original, unprefixed paths). Do not include
     # items already prefixed with DISABLED at program start. Also skip
     # any paths requested to be excluded via EXCLUDE_PATHS.
+    excluded = {os.path.abspath(ex) for ex in EXCLUDE_PATHS if ex}
+    excluded_prefixes = tuple(ex + os.sep for ex in excluded)
+
     candidates: List[str] = []
-    original_disabled_on_disk: Set[str] = set()
     for m in mods:
-        name = m["name"]
+        # the walk never enters DISABLED folders; this only catches a
+        # start path that is itself named DISABLED ...
+        if _is_disabled_name(m["name"]):
+            continue
         disk_path = os.path.abspath(m["path"])
-        if _is_disabled_name(name):
-            original_disabled_on_disk.add(disk_path)
-        else:
-            # skip if in EXCLUDE_PATHS or under any excluded folder
-            def _is_under_excluded(p: str) -> bool:
-                try:
-                    for ex in EXCLUDE_PATHS:
-                        if not ex:
-                            continue
-                        ex_a = os.path.abspath(ex)
-                        if p == ex_a or p.startswith(ex_a + os.sep):
-                            return True
-                except Exception:
-                    pass
-                return False
-
-            if _is_under_excluded(disk_path):
-                continue
-            candidates.append(disk_path)
+        # skip if in EXCLUDE_PATHS or under any excluded folder
+        if disk_path in excluded or disk_path.startswith(excluded_prefixes):
+            continue
+        candidates.append(disk_path)
 
     if not candidates:
         print("활성화된(비활성화되지 않은) 모드가 없습니다.")
         return
 
-    # Helpers to enable/disable only candidates we control
-    def ensure_disabled(orig: str) -> None:
-        if os.path.exists(orig):
-            disabled = disable_folder(orig)
-            # only record when we actually renamed to a DISABLED name
-            if _is_disabled_name(os.path.basename(disabled)) and os.path.exists(disabled):
-                program_disabled.append(disabled)
-                # persist runtime-disabled list if requested
-                if STATE_FILE:
-                    _save_state()
-
-    def ensure_enabled_if_recorded(orig: str) -> None:
-        # If we previously disabled this orig during this run, re-enable it.
-        d = _disabled_name_for(orig)
-        if (
-            d in program_disabled
-            and os.path.exists(d)
-            and _is_disabled_name(os.path.basename(d))
-        ):
-            newp = enable_folder(d)
-            # if original disabled path no longer exists, enable succeeded
-            if not os.path.exists(d) and d in program_disabled:
-                program_disabled.remove(d)
-
-    def set_active_group(group: List[str]) -> None:
-        """Ensure only `group` (subset of `candidates`) is enabled.
+    # Per-candidate data is fixed for the whole run: derive it once into
+    # parallel lists and refer to candidates by index from here on.
+    paths = candidates
+    names = [os.path.basename(p) for p in paths]
+    disabled_paths = [
+        os.path.join(os.path.dirname(p), DISABLED_PREFIX + n)
+        for p, n in zip(paths, names)
+    ]
+    labels = [f"- {n}: {p}" for n, p in zip(names, paths)]
+    indices = range(len(paths))
+
+    def set_active_group(group: Set[int]) -> None:
+        """Ensure only candidate indices in `group` are enabled.
 
         All other candidates will be disabled (if not already) and
-        recorded so they can be restored later.
+        recorded so they can be restored later. Only candidates this
+        program disabled are ever re-enabled.
         """
-        group_set = set(group)
-        for orig in candidates:
-            if orig in group_set:
-                ensure_enabled_if_recorded(orig)
-            else:
-                ensure_disabled(orig)
+        # plan the whole wave first, then rename
+        to_enable = [i for i in indices if i in group]
+        to_disable = [i for i in indices if i not in group]
+        to_enable = [i for i in to_enable if disabled_paths[i] in program_disabled]
+        to_disable = [i for i in to_disable if disabled_paths[i] not in program_disabled]
 
-    # Bisection loop: narrow `current` to a single candidate
-    current = candidates.copy()
+        def enabled(i: int) -> None:
+            program_disabled.discard(disabled_paths[i])
+
+        def disabled(i: int) -> None:
+            program_disabled.add(disabled_paths[i])
+            # queue runtime-disabled entry for the state file
+            _save_state_append(disabled_paths[i])
+
+        recorded = len(program_disabled)
+        try:
+            results = _rename_parallel([(disabled_paths[i], paths[i]) for i in to_enable])
+            for i, ok in zip(to_enable, results):
+                if ok:
+                    enabled(i)
+            for i, ok in zip(to_enable, results):
+                if ok is None and _rename_with_retry(disabled_paths[i], paths[i]):
+                    enabled(i)
+        finally:
+            # drop re-enabled folders from the log once per wave (also on
+            # abort); disabled folders are queued as they are renamed
+            if len(program_disabled) != recorded:
+                _schedule_compact()
+
+        results = _rename_parallel([(paths[i], disabled_paths[i]) for i in to_disable])
+        # record every successful rename before any retry prompt can abort
+        for i, ok in zip(to_disable, results):
+            if ok:
+                disabled(i)
+        for i, ok in zip(to_disable, results):
+            if ok is None and _rename_with_retry(paths[i], disabled_paths[i]):
+                disabled(i)
+
+    # Bisection loop: narrow `current` to a single candidate index
+    current = list(indices)
     try:
         while len(current) > 1:
             if STOP_EVENT and STOP_EVENT.is_set():
@@ -328,31 +529,23 @@ def run_bisection(start_path: str) -> None:
             mid = len(current) // 2
             first = current[:mid]
             second = current[mid:]
+            first_set = set(first)
 
             # Test first half: enable only `first` and keep others disabled
-            set_active_group(first)
+            set_active_group(first_set)
 
             # Output disabled and remaining lists (on-disk paths)
-            disabled_list = [
-                {"name": os.path.basename(p), "path": p}
-                for p in candidates
-                if p not in first
-            ]
-            remaining_list = [{"name": os.path.basename(p), "path": p} for p in first]
-            # Print readable summaries
-            print("비활성화된 항목:")
-            if disabled_list:
-                for d in disabled_list:
-                    print(f"- {d['name']}: {d['path']}")
-            else:
-                print("(없음)")
-            print("남아있는 항목:")
-            if remaining_list:
-                for r in remaining_list:
-                    print(f"- {r['name']}: {r['path']}")
-            else:
-                print("(없음)")
-
+            disabled_lines = [labels[i] for i in indices if i not in first_set]
+            remaining_lines = [labels[i] for i in first]
+            # Print readable summaries once all renames of this step are done
+            out = ["비활성화된 항목:"]
+            out.extend(disabled_lines or ["(없음)"])
+            out.append("남아있는 항목:")
+            out.extend(remaining_lines or ["(없음)"])
+            _write_lines(out)
+
+            # step boundary: persist this wave before waiting on the user
+            _flush_state()
             resp = (
                 ASK_FN(
                     "이 상태에서 문제(또는 원하는 결과)가 발생합니까?\n인게임에서 F10을 눌러 확인하세요: "
@@ -369,19 +562,19 @@ def run_bisection(start_path: str) -> None:
             else:
                 # problem does not occur with first enabled => culprit in second
                 # switch to second as active group
-                set_active_group(second)
+                set_active_group(set(second))
                 current = second
 
         # Print result if single candidate remains
         if len(current) == 1:
             # determine on-disk path (it may be disabled name or original depending on state)
-            on_disk = _disabled_name_for(current[0])
-            if os.path.exists(current[0]):
-                final = current[0]
-            elif os.path.exists(on_disk):
-                final = on_disk
+            i = current[0]
+            if os.path.exists(paths[i]):
+                final = paths[i]
+            elif os.path.exists(disabled_paths[i]):
+                final = disabled_paths[i]
             else:
-                final = current[0]
+                final = paths[i]
             # Report via RESULT_FN if provided (GUI), else print
             if RESULT_FN:
                 try:
@@ -394,12 +587,21 @@ def run_bisection(start_path: str) -> None:
             print("검색이 종료되었습니다.")
 
     finally:
+        try:
+            _flush_state()
+        except Exception as e:
+            # recovery below must still run; entries that did not reach the
+            # state file are restored from memory instead
+            print(f"상태 파일 저장 실패: {e}", file=sys.stderr)
         # If a state file was provided, use it to recover (enable) entries
         # we persisted during the run. If no state file is set, there is
         # nothing to recover here.
         if STATE_FILE and not (STOP_EVENT and STOP_EVENT.is_set()):
             # Only auto-recover when the run was not aborted by the user.
             recover_from_state(src_ini, STATE_FILE)
+            for d in list(program_disabled):
+                if enable_folder(d) != d:
+                    program_disabled.discard(d)
 
 
 def main() -> None:
@@ -414,7 +616,7 @@ def main() -> None:
         "--state",
         "-s",
         required=True,
-        help="Path to save runtime-disabled list (JSON) (required)",
+        help="Path to save runtime-disabled list (one path per line) (required)",
     )
 
     rec = sub.add_parser("recover", help="Recover from a saved state file")
@@ -439,7 +641,7 @@ def main() -> None:
         if not path:
             print("경로가 제공되지 않았습니다.")
             return
-        state = input("상태 파일 경로를 입력하세요 (저장할 JSON 파일): ").strip()
+        state = input("상태 파일 경로를 입력하세요 (저장할 파일): ").strip()
         if not state:
             print("상태 파일 경로는 필수입니다.")
             return
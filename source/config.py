@@ -20,10 +20,30 @@ def _ensure_parser():
 
 
 def load_last_path() -> str:
-    """Return last saved path or empty string."""
-    cp = _ensure_parser()
-    if cp.has_section(_SECTION) and cp.has_option(_SECTION, _KEY):
-        return cp.get(_SECTION, _KEY)
+    """Return last saved path or empty string.
+
+    Reads the single `[settings] last_path` entry directly instead of going
+    through configparser; `save_last_path` still uses configparser.
+    """
+    try:
+        with open(_INI_PATH, "r", encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+    except Exception:
+        # missing or unreadable file
+        return ""
+    section = None
+    for line in lines:
+        s = line.strip()
+        if not s or s[0] in "#;":
+            continue
+        if s.startswith("[") and s.endswith("]"):
+            section = s[1:-1].strip()
+            continue
+        if section != _SECTION:
+            continue
+        key, sep, value = s.partition("=")
+        if sep and key.strip().lower() == _KEY:
+            return value.strip()
     return ""
 
 
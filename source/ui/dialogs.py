@@ -2,7 +2,13 @@ import tkinter as tk
 from tkinter import ttk
 import threading
 import os
-from typing import Callable
+from collections import deque
+from typing import Callable, Iterator
+
+
+# Folder name prefixes never offered for exclusion (hidden, disabled mods,
+# caches such as __pycache__); their subtrees are not walked either.
+_SKIP_DIR_PREFIXES = (".", "DISABLED ", "__")
 
 
 def show_text_window(root: tk.Tk, title: str, text: str) -> None:
@@ -19,6 +25,8 @@ def make_ask_fn(root: tk.Tk, stop_ev: threading.Event) -> Callable[[str], str]:
 
     The returned function blocks the caller thread until the user chooses an option
     or `stop_ev` is set. If `stop_ev` is set while waiting, it returns 'a' (abort).
+    `stop_ev` is watched from the Tk event loop, so the caller thread blocks on a
+    single event wait instead of polling.
     """
 
     def ask_fn(prompt: str) -> str:
@@ -34,12 +42,23 @@ def make_ask_fn(root: tk.Tk, stop_ev: threading.Event) -> Callable[[str], str]:
             lbl.pack(padx=12, pady=8)
 
             def choose(v: str) -> None:
+                if ev.is_set():
+                    return
                 res["value"] = v
                 try:
                     top.destroy()
                 finally:
                     ev.set()
 
+            def _watch_stop() -> None:
+                # runs on the UI thread for as long as the dialog is open
+                if ev.is_set():
+                    return
+                if stop_ev.is_set():
+                    choose("a")
+                    return
+                root.after(100, _watch_stop)
+
             f = ttk.Frame(top)
             f.pack(pady=8)
             for lab, val in buttons:
@@ -60,7 +79,7 @@ def make_ask_fn(root: tk.Tk, stop_ev: threading.Event) -> Callable[[str], str]:
             except Exception:
                 pass
 
-            return top
+            _watch_stop()
 
         # choose button set
         if "다시시도" in prompt or ("R" in prompt and "S" in prompt and "A" in prompt):
@@ -68,28 +87,47 @@ def make_ask_fn(root: tk.Tk, stop_ev: threading.Event) -> Callable[[str], str]:
         else:
             buttons = [("예", "y"), ("아니오", "n"), ("중단", "a")]
 
-        dialog_ref = {"top": None}
+        if stop_ev.is_set():
+            return "a"
 
-        def _show_and_record():
-            dialog_ref["top"] = _show_dialog(buttons)
+        def _show_or_abort():
+            try:
+                _show_dialog(buttons)
+            except Exception:
+                # no dialog means no one can answer; treat as abort
+                res["value"] = "a"
+                ev.set()
 
-        root.after(0, _show_and_record)
+        root.after(0, _show_or_abort)
 
-        while True:
-            if ev.wait(timeout=0.1):
-                return res["value"]
-            if stop_ev.is_set():
-                # close dialog if open
-                if dialog_ref["top"]:
-                    try:
-                        root.after(0, lambda: dialog_ref["top"].destroy())
-                    except Exception:
-                        pass
-                return "a"
+        # both a button choice and `stop_ev` (via _watch_stop) end in ev.set()
+        ev.wait()
+        return res["value"]
 
     return ask_fn
 
 
+def _iter_dirs_bfs(base_path: str) -> Iterator[str]:
+    """Yield `base_path` and every directory below it in breadth-first order.
+
+    Parents are always yielded before their children. Unreadable
+    directories and those matching `_SKIP_DIR_PREFIXES` are skipped.
+    """
+    queue = deque([base_path])
+    while queue:
+        d = queue.popleft()
+        yield d
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.name.startswith(_SKIP_DIR_PREFIXES):
+                        continue
+                    if e.is_dir(follow_symlinks=False):
+                        queue.append(e.path)
+        except OSError:
+            continue
+
+
 def select_exclusions(root: tk.Tk, base_path: str) -> list:
     """Show a modal dialog that displays folder tree under `base_path`.
 
@@ -100,10 +138,8 @@ def select_exclusions(root: tk.Tk, base_path: str) -> list:
         return None
 
     # collect directories under base_path (include base_path itself)
-    dirs = []
     try:
-        for root_dir, subdirs, _ in os.walk(base_path):
-            dirs.append(root_dir)
+        dirs = list(_iter_dirs_bfs(base_path))
     except Exception:
         return None
 
@@ -146,9 +182,8 @@ def select_exclusions(root: tk.Tk, base_path: str) -> list:
         nodes[path_abs] = iid
         checked[path_abs] = False
 
-    # ensure stable ordering
-    dirs_sorted = sorted(dirs, key=lambda p: p.count(os.sep))
-    for d in dirs_sorted:
+    # `dirs` is breadth-first, so every parent node exists before its children
+    for d in dirs:
         add_node(d)
 
     # clicking a row toggles its checkbox state